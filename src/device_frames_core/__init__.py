@@ -1,4 +1,4 @@
-from .core import apply_frame, find_template, get_frame_image, get_mask_image, list_devices
+from .core import apply_frame, apply_frames, find_template, get_frame_image, get_mask_image, list_devices, prefetch_index
 from .errors import DeviceFramesError, TemplateAmbiguousError, TemplateNotFoundError
 
 __all__ = [
@@ -6,8 +6,10 @@ __all__ = [
     "TemplateAmbiguousError",
     "TemplateNotFoundError",
     "apply_frame",
+    "apply_frames",
     "find_template",
     "get_frame_image",
     "get_mask_image",
     "list_devices",
+    "prefetch_index",
 ]
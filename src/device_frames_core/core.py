@@ -1,41 +1,291 @@
 from __future__ import annotations
 
-import json
+import hashlib
+import math
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, wraps
 from io import BytesIO
 from pathlib import Path
-from typing import Optional, Tuple
-from urllib.request import urlopen
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Literal, Optional, Tuple
 
-from PIL import Image, ImageFilter
+from PIL import Image, ImageChops, ImageOps
 
 from .errors import TemplateAmbiguousError, TemplateNotFoundError
 
+if TYPE_CHECKING:
+    import requests
+
+# orjson parses the index several times faster and reads bytes directly.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 
 # URL to the device frames index JSON
 DEVICE_FRAMES_INDEX_URL = "https://raw.githubusercontent.com/jonnyjackson26/device-frames-media/main/device-frames-output/index.json"
 
+# On-disk cache for downloaded files, shared across processes
+CACHE_DIR = Path(
+    os.environ.get("DEVICE_FRAMES_CACHE_DIR")
+    or Path.home() / ".cache" / "device-frames-core"
+)
+
+# How long (in seconds) cached files are used before being revalidated
+INDEX_CACHE_TTL = 5 * 60
+IMAGE_CACHE_TTL = 24 * 60 * 60
+
+# (connect, read) timeouts in seconds for HTTP requests
+HTTP_TIMEOUT = (5, 30)
+
+# Resampling filter used to fit screenshots to the screen for each quality
+_RESAMPLING_FILTERS = {
+    "fast": Image.Resampling.BILINEAR,
+    "high": Image.Resampling.LANCZOS,
+}
+
+# Screenshots at least twice this many times larger than the screen are first
+# box-reduced to this multiple of it, so the filter runs on fewer pixels
+_REDUCING_GAP = 3.0
+
+# Shared HTTP session, created on first use by _get_session
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
 # Cache for the device frames index
 _device_frames_cache: Optional[dict] = None
 
+# Guards publishing a newly loaded index and its lookup together
+_index_lock = threading.Lock()
+
+# Held during the first index fetch, so concurrent first lookups and the
+# prefetch share one download. _reset_after_fork replaces it in child
+# processes, so a fetch in flight at fork time can't leave it held there.
+_index_fetch_lock = threading.Lock()
+
+# Cache for the (device, variation) -> [(category, template)] lookup
+_template_lookup_cache: Optional[dict] = None
+
+# When the cached index was loaded (time.monotonic()) and how long a network
+# fetch of it takes, used to schedule early background refreshes. The fetch
+# time is a guess until one has been timed.
+_index_cached_at = 0.0
+_index_fetch_time = 1.0
+_index_refreshing = False
+
+# Wall-clock time the cached index was last validated against the server,
+# i.e. the mtime of the disk entry it was read from
+_index_validated_at = 0.0
+
+
+def _get_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use.
+
+    The index, frame and mask downloads all go to the same host, so sharing a
+    session reuses keep-alive connections (and TLS sessions). requests is
+    imported here because it dominates the package's import time.
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+                _session = session
+
+    return _session
+
+
+def _write_cache_file(path: Path, data: bytes) -> None:
+    """Atomically write a cache file. The cache is best-effort, so errors are ignored."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _cache_path(url: str) -> Path:
+    """Return the on-disk cache path for a URL's body. Its ETag is stored next to it."""
+    return CACHE_DIR / hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def _cache_mtime(path: Path) -> Optional[float]:
+    """Return when a cache entry was last written or revalidated, or None if it is missing."""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _fetch(url: str, ttl: float) -> bytes:
+    """Return the body of a URL, using the on-disk cache while it is fresher than ttl.
+
+    Stale entries are revalidated with their ETag, so an unchanged file costs a
+    304 response instead of a full download, and are still returned if the
+    request fails.
+    """
+    body_path = _cache_path(url)
+    etag_path = body_path.with_name(f"{body_path.name}.etag")
+
+    cached: Optional[bytes] = None
+    try:
+        if time.time() - body_path.stat().st_mtime < ttl:
+            return body_path.read_bytes()
+        cached = body_path.read_bytes()
+        etag = etag_path.read_text()
+    except OSError:
+        etag = None
+
+    import requests
+
+    headers = {"If-None-Match": etag} if cached is not None and etag else {}
+    try:
+        response = _get_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException:
+        # Offline or failing: a stale copy is better than no copy.
+        if cached is None:
+            raise
+        return cached
+
+    if response.status_code == 304 and cached is not None:
+        # Still current: restart the TTL without rewriting the body.
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return cached
+
+    _write_cache_file(body_path, response.content)
+    if response.headers.get("ETag"):
+        _write_cache_file(etag_path, response.headers["ETag"].encode("utf-8"))
+
+    return response.content
+
+
+def _normalize_name(name: str) -> str:
+    """Normalize a category, device or variation name for lookups."""
+    return name.strip().lower()
+
+
+def _normalize_index(index: dict) -> dict:
+    """Return the index with every category, device and variation name normalized."""
+    return {
+        _normalize_name(category_name): {
+            _normalize_name(device_name): {
+                _normalize_name(variation_name): variation_data
+                for variation_name, variation_data in device_variations.items()
+            }
+            for device_name, device_variations in category_devices.items()
+        }
+        for category_name, category_devices in index.items()
+    }
+
+
+def _build_template_lookup(index: dict) -> dict:
+    """Flatten the index into a (device, variation) -> [(category, template)] lookup."""
+    lookup: dict[tuple[str, str], list[tuple[str, dict]]] = {}
+    for category_name, category_devices in index.items():
+        for device_name, device_variations in category_devices.items():
+            for variation_name, variation_data in device_variations.items():
+                lookup.setdefault((device_name, variation_name), []).append(
+                    (category_name, variation_data)
+                )
+    return lookup
+
+
+def _load_index(ttl: float) -> None:
+    """Fetch the index and swap it in with its lookup."""
+    global _device_frames_cache, _template_lookup_cache
+    global _index_cached_at, _index_fetch_time, _index_validated_at
+
+    body_path = _cache_path(DEVICE_FRAMES_INDEX_URL)
+    mtime_before = _cache_mtime(body_path)
+    started = time.monotonic()
+    index = _normalize_index(_json_loads(_fetch(DEVICE_FRAMES_INDEX_URL, ttl)))
+    fetch_time = time.monotonic() - started
+    lookup = _build_template_lookup(index)
+    # _fetch writes or touches the disk entry whenever it reaches the server.
+    mtime_after = _cache_mtime(body_path)
+
+    with _index_lock:
+        if mtime_after is None or mtime_after != mtime_before:
+            _index_fetch_time = fetch_time
+        _index_validated_at = mtime_after if mtime_after is not None else time.time()
+        _index_cached_at = time.monotonic()
+        _template_lookup_cache = lookup
+        _device_frames_cache = index
+
+
+def _refresh_index() -> None:
+    """Revalidate the index in the background, keeping the current one on failure."""
+    global _index_cached_at, _index_refreshing
+
+    try:
+        # Reuse the disk entry if another process has revalidated it since this
+        # one loaded its index, so only the first refresher contacts the server.
+        _load_index(min(time.time() - _index_validated_at, INDEX_CACHE_TTL))
+    except Exception:
+        # Try again after another full TTL rather than on every lookup.
+        _index_cached_at = time.monotonic()
+    finally:
+        _index_refreshing = False
+
 
 def _get_device_frames_index() -> dict:
-    """Fetch and cache the device frames index from the remote URL."""
-    global _device_frames_cache
-    
+    """Fetch and cache the device frames index from the remote URL.
+
+    The cached index is refreshed in the background shortly before
+    INDEX_CACHE_TTL runs out, with a probability that rises towards expiry
+    (XFetch). Processes that loaded it together then don't all refetch at once.
+    """
+    global _index_refreshing
+
     if _device_frames_cache is None:
-        with urlopen(DEVICE_FRAMES_INDEX_URL) as response:
-            _device_frames_cache = json.loads(response.read().decode('utf-8'))
-    
+        with _index_fetch_lock:
+            if _device_frames_cache is None:
+                _load_index(INDEX_CACHE_TTL)
+    elif not _index_refreshing:
+        age = time.monotonic() - _index_cached_at
+        if age - _index_fetch_time * math.log(1.0 - random.random()) >= INDEX_CACHE_TTL:
+            # Concurrent lookups can all get here; only the first starts a refresh.
+            with _index_lock:
+                start_refresh = not _index_refreshing
+                _index_refreshing = True
+            if start_refresh:
+                threading.Thread(
+                    target=_refresh_index, name="device-frames-refresh", daemon=True
+                ).start()
+
     return _device_frames_cache
 
 
+def _get_template_lookup() -> dict:
+    """Return the cached (device, variation) lookup, fetching the index if needed."""
+    _get_device_frames_index()
+    return _template_lookup_cache
+
+
 def list_devices(
     category: Optional[str] = None,
     device: Optional[str] = None,
 ) -> list[dict]:
     """Return all available devices and variations, optionally filtered by category and/or device.
     
-    If device is specified, category must also be specified.
+    If device is specified, category must also be specified. Names are matched
+    case-insensitively.
     """
     
     if device and not category:
@@ -43,15 +293,21 @@ def list_devices(
 
     index = _get_device_frames_index()
     devices = []
+
+    # Index straight into the requested category/device instead of scanning.
+    if category:
+        category = _normalize_name(category)
+        index = {category: index[category]} if category in index else {}
+    if device:
+        device = _normalize_name(device)
     
     for category_name, category_devices in index.items():
-        if category and category_name != category:
-            continue
+        if device:
+            category_devices = (
+                {device: category_devices[device]} if device in category_devices else {}
+            )
             
         for device_name, device_variations in category_devices.items():
-            if device and device_name != device:
-                continue
-                
             for variation_name, variation_data in device_variations.items():
                 devices.append({
                     "category": category_name,
@@ -70,23 +326,18 @@ def _find_template_data(
     category: Optional[str],
 ) -> dict:
     """Find and return the template data for the given device and variation."""
-    index = _get_device_frames_index()
-    
-    matches = []
-    
-    for category_name, category_devices in index.items():
-        if category and category_name != category:
-            continue
-            
-        for device_name, device_variations in category_devices.items():
-            if device_name != device:
-                continue
-                
-            if variation in device_variations:
-                matches.append({
-                    "category": category_name,
-                    "data": device_variations[variation]
-                })
+    # Reject obviously bad arguments before the index is (possibly) downloaded.
+    for name, value in (("device", device), ("variation", variation)):
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"{name} must be a non-empty string")
+
+    category_key = _normalize_name(category) if category else None
+    lookup_key = (_normalize_name(device), _normalize_name(variation))
+    matches = [
+        variation_data
+        for category_name, variation_data in _get_template_lookup().get(lookup_key, [])
+        if not category_key or category_name == category_key
+    ]
     
     if not matches:
         raise TemplateNotFoundError(
@@ -98,7 +349,7 @@ def _find_template_data(
             "Multiple templates matched. Specify a category to disambiguate."
         )
 
-    return matches[0]["data"]
+    return matches[0]
 
 
 def find_template(
@@ -111,11 +362,102 @@ def find_template(
     return _find_template_data(device, variation, category)
 
 
+def _expiring_cache(maxsize: int, ttl: float):
+    """Like lru_cache(maxsize), but entries also expire ttl seconds after they were loaded.
+
+    Concurrent misses for the same arguments share a single call instead of
+    each loading the result. The decorated function gets cache_get(*args),
+    which returns the cached result if it is still fresh and None otherwise,
+    and cache_clear().
+    """
+    def decorator(func):
+        cache: OrderedDict = OrderedDict()  # args -> (loaded_at, result)
+        in_flight: dict = {}  # args -> Future of the call loading them
+        lock = threading.Lock()
+
+        def get_fresh(args):
+            # Callers hold lock.
+            entry = cache.get(args)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= ttl:
+                del cache[args]
+                return None
+            cache.move_to_end(args)
+            return entry[1]
+
+        def cache_get(*args):
+            with lock:
+                return get_fresh(args)
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+
+        @wraps(func)
+        def wrapper(*args):
+            with lock:
+                result = get_fresh(args)
+                if result is not None:
+                    return result
+                future = in_flight.get(args)
+                loading = future is None
+                if loading:
+                    future = in_flight[args] = Future()
+
+            if not loading:
+                return future.result()
+
+            try:
+                result = func(*args)
+            except BaseException as exc:
+                with lock:
+                    del in_flight[args]
+                future.set_exception(exc)
+                raise
+
+            with lock:
+                del in_flight[args]
+                cache[args] = (time.monotonic(), result)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            future.set_result(result)
+            return result
+
+        def reset_after_fork() -> None:
+            # Loads running in other threads at the fork never finish in the child.
+            nonlocal lock, in_flight
+            lock = threading.Lock()
+            in_flight = {}
+
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=reset_after_fork)
+
+        wrapper.cache_get = cache_get
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+@_expiring_cache(maxsize=8, ttl=IMAGE_CACHE_TTL)
 def _download_image(url: str) -> Image.Image:
-    """Download an image from a URL and return it as a PIL Image."""
-    with urlopen(url) as response:
-        image_data = response.read()
-        return Image.open(BytesIO(image_data))
+    """Download an image from a URL and return it as a fully decoded PIL Image.
+
+    Decoding up front means the image never reads from its source buffer again,
+    so it is safe to share across threads. Results are cached per URL for
+    IMAGE_CACHE_TTL and must not be mutated.
+    """
+    image = Image.open(BytesIO(_fetch(url, IMAGE_CACHE_TTL)))
+    image.load()
+    return image
+
+
+def _copy_image(image: Image.Image) -> Image.Image:
+    """Return a caller-owned copy of a cached image, keeping its format."""
+    copy = image.copy()
+    copy.format = image.format
+    return copy
 
 
 def get_frame_image(
@@ -126,7 +468,7 @@ def get_frame_image(
 ) -> Image.Image:
     """Load and return the frame image for the given device and variation."""
     template_data = _find_template_data(device, variation, category)
-    return _download_image(template_data["frame"])
+    return _copy_image(_download_image(template_data["frame"]))
 
 
 def get_mask_image(
@@ -137,58 +479,272 @@ def get_mask_image(
 ) -> Image.Image:
     """Load and return the mask image for the given device and variation."""
     template_data = _find_template_data(device, variation, category)
-    return _download_image(template_data["mask"])
+    return _copy_image(_download_image(template_data["mask"]))
+
+
+def _dilate_mask(mask: Image.Image) -> Image.Image:
+    """Return a 3x3 max-filtered copy of a single-band mask.
+
+    Equivalent to ``mask.filter(ImageFilter.MaxFilter(3))``, but computed as a
+    separable shift-and-max with ``ImageChops.lighter``, which avoids the rank
+    filter's per-pixel sort and is an order of magnitude faster.
+    """
+    width, height = mask.size
+    # Zero padding is neutral for max, so the border behaves like MaxFilter's.
+    padded = ImageOps.expand(mask, border=1, fill=0)
+
+    rows = ImageChops.lighter(
+        ImageChops.lighter(
+            padded.crop((0, 0, width, height + 2)),
+            padded.crop((1, 0, width + 1, height + 2)),
+        ),
+        padded.crop((2, 0, width + 2, height + 2)),
+    )
+    return ImageChops.lighter(
+        ImageChops.lighter(
+            rows.crop((0, 0, width, height)),
+            rows.crop((0, 1, width, height + 1)),
+        ),
+        rows.crop((0, 2, width, height + 2)),
+    )
+
+
+@_expiring_cache(maxsize=4, ttl=IMAGE_CACHE_TTL)
+def _load_frame_assets(
+    frame_url: str,
+    mask_url: str,
+    screen_box: Tuple[int, int, int, int],
+) -> Tuple[Image.Image, Image.Image]:
+    """Download, decode and cache the per-template inputs of apply_frame.
+
+    Returns the frame converted to RGBA and the mask cropped to ``screen_box``
+    and dilated, i.e. everything that does not depend on the screenshot. Each
+    entry holds a full-size RGBA frame, so only a few templates are kept, each
+    for at most IMAGE_CACHE_TTL. The returned images are shared
+    between calls and must not be mutated.
+    """
+    # Download the mask in the background while the frame is fetched here.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        mask_future = executor.submit(_download_image, mask_url)
+        frame = _download_image(frame_url)
+        mask = mask_future.result()
+
+    if frame.mode != "RGBA":
+        frame = frame.convert("RGBA")
+
+    # Dilate the mask slightly to avoid subpixel gaps at rounded corners/notches.
+    # A uniform region (e.g. a plain rectangular screen) is unchanged by it.
+    screen_mask = mask.crop(screen_box)
+    low, high = screen_mask.getextrema()
+    if low != high:
+        screen_mask = _dilate_mask(screen_mask)
+
+    return frame, screen_mask
+
+
+def _resize_screenshot(
+    screenshot: Image.Image,
+    size: Tuple[int, int],
+    resample: Image.Resampling,
+) -> Image.Image:
+    """Resize a screenshot to the screen size, in RGB or RGBA mode."""
+    # Let JPEG decoding downscale in the DCT domain while staying at least
+    # twice the screen size, like Image.thumbnail does. No-op for other formats.
+    screenshot.draft(None, (size[0] * 2, size[1] * 2))
+
+    # putalpha() promotes RGB to RGBA in place, so only other modes need an
+    # explicit conversion. Do it before resizing when upscaling (fewer pixels
+    # to convert) and for "1"/"P" images, which resize() would only sample
+    # with NEAREST; otherwise convert the smaller, resized image. Images
+    # without alpha go to RGB, which resize() handles without premultiplying.
+    if screenshot.mode not in ("RGB", "RGBA") and (
+        screenshot.mode in ("1", "P")
+        or screenshot.width * screenshot.height < size[0] * size[1]
+    ):
+        has_alpha = screenshot.mode in ("LA", "PA") or "transparency" in screenshot.info
+        screenshot = screenshot.convert("RGBA" if has_alpha else "RGB")
+
+    screenshot_resized = screenshot.resize(size, resample, reducing_gap=_REDUCING_GAP)
+
+    if screenshot_resized.mode not in ("RGB", "RGBA"):
+        screenshot_resized = screenshot_resized.convert("RGBA")
+
+    return screenshot_resized
+
+
+@lru_cache(maxsize=8)
+def _load_resized_screenshot(
+    path: str,
+    mtime_ns: int,
+    size: Tuple[int, int],
+    resample: Image.Resampling,
+) -> Image.Image:
+    """Open, resize and cache a screenshot file for reuse across frames.
+
+    ``mtime_ns`` is only part of the cache key, so edited files are reloaded.
+    The returned image is shared between calls and must not be mutated.
+    """
+    with Image.open(path) as screenshot:
+        return _resize_screenshot(screenshot, size, resample)
 
 
 def apply_frame(
-    screenshot_path: Path,
+    screenshot_path: Path | BinaryIO,
     device: str,
     variation: str,
     output_path: Path,
     *,
     category: Optional[str] = None,
     background_color: Tuple[int, int, int, int] | Tuple[int, int, int] = (0, 0, 0, 0),
+    compress_level: int = 6,
+    quality: Literal["fast", "high"] = "high",
 ) -> Path:
-    """Apply a device frame to a screenshot and save the output image."""
+    """Apply a device frame to a screenshot and save the output image.
+
+    ``screenshot_path`` may also be an open binary file object (for example an
+    uploaded file), which is decoded directly without a temporary copy.
+
+    With an opaque ``background_color`` the output has no transparency and is
+    saved as RGB (so JPEG output paths work too); otherwise it is RGBA.
+
+    ``compress_level`` is the zlib level (0-9) used for PNG output. Lower levels
+    encode noticeably faster at the cost of larger files.
+
+    ``quality`` selects how the screenshot is resized to the screen: "high"
+    uses LANCZOS, which keeps UI text crisp when downscaling; "fast" uses
+    BILINEAR, roughly twice as fast but slightly softer.
+    """
+
+    if quality not in _RESAMPLING_FILTERS:
+        raise ValueError(f"quality must be 'fast' or 'high', got {quality!r}")
+    resample = _RESAMPLING_FILTERS[quality]
     
     template = _find_template_data(device, variation, category)
     
-    # Download frame and mask images
-    frame = _download_image(template["frame"])
-    mask = _download_image(template["mask"])
-    screenshot = Image.open(screenshot_path)
-
     screen = template["screen"]
-
-    screenshot_resized = screenshot.resize(
-        (screen["width"], screen["height"]),
-        Image.Resampling.LANCZOS,
+    screen_box = (
+        screen["x"],
+        screen["y"],
+        screen["x"] + screen["width"],
+        screen["y"] + screen["height"],
     )
 
-    if screenshot_resized.mode != "RGBA":
-        screenshot_resized = screenshot_resized.convert("RGBA")
+    asset_key = (template["frame"], template["mask"], screen_box)
+    assets = _load_frame_assets.cache_get(*asset_key)
+
+    # On a cache miss, load the frame assets in the background while the
+    # screenshot is resized.
+    executor = None
+    if assets is None:
+        executor = ThreadPoolExecutor(max_workers=1)
+        assets_future = executor.submit(_load_frame_assets, *asset_key)
+
+    try:
+        size = (screen["width"], screen["height"])
+        screenshot_shared = isinstance(screenshot_path, (str, os.PathLike))
+        if screenshot_shared:
+            path = os.path.abspath(screenshot_path)
+            screenshot_resized = _load_resized_screenshot(
+                path, os.stat(path).st_mtime_ns, size, resample
+            )
+        else:
+            screenshot_resized = _resize_screenshot(
+                Image.open(screenshot_path), size, resample
+            )
+
+        if assets is None:
+            assets = assets_future.result()
+    finally:
+        if executor is not None:
+            # If the screenshot failed, raise now; the download still finishes
+            # (and is cached) in the background.
+            executor.shutdown(wait=False)
+
+    frame, mask_region = assets
+
+    frame_size = (template["frameSize"]["width"], template["frameSize"]["height"])
+    background_alpha = background_color[3] if len(background_color) == 4 else 255
+
+    if background_alpha == 255:
+        # Over an opaque background "over" is just a masked paste and the result
+        # is opaque, so composite in RGB and skip putalpha() and the RGBA blends.
+        composite = Image.new("RGB", frame_size, tuple(background_color[:3]))
+        composite.paste(screenshot_resized, screen_box[:2], mask_region)
+        composite.paste(frame, (0, 0), frame)
+    else:
+        if screenshot_shared:
+            # The cached image is shared and putalpha() mutates it.
+            screenshot_resized = screenshot_resized.copy()
+        screenshot_resized.putalpha(mask_region)
+
+        # alpha_composite is a true "over" operator and runs on Pillow's dedicated
+        # blend kernel (SIMD-accelerated when Pillow-SIMD is installed).
+        if background_alpha == 0 and frame.size == frame_size:
+            # Over a transparent background the frame is already the result outside
+            # the screen, so only blend the screen area and copy everything else.
+            screenshot_resized.alpha_composite(frame, source=screen_box)
+            composite = frame.copy()
+            composite.paste(screenshot_resized, screen_box[:2])
+        else:
+            composite = Image.new("RGBA", frame_size, background_color)
+            composite.alpha_composite(screenshot_resized, dest=screen_box[:2])
+            composite.alpha_composite(frame)
 
-    mask_region = mask.crop(
-        (
-            screen["x"],
-            screen["y"],
-            screen["x"] + screen["width"],
-            screen["y"] + screen["height"],
-        )
-    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    composite.save(output_path, compress_level=compress_level)
 
-    mask_region = mask_region.filter(ImageFilter.MaxFilter(3))
-    screenshot_resized.putalpha(mask_region)
+    return output_path
 
-    composite = Image.new(
-        "RGBA",
-        (template["frameSize"]["width"], template["frameSize"]["height"]),
-        background_color,
-    )
-    composite.paste(screenshot_resized, (screen["x"], screen["y"]), screenshot_resized)
-    composite.paste(frame, (0, 0), frame)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    composite.save(output_path)
+def apply_frames(
+    jobs: Iterable[dict],
+    *,
+    max_workers: Optional[int] = None,
+) -> list[Path]:
+    """Apply device frames to many screenshots concurrently.
+
+    Each job is a dict of apply_frame keyword arguments. Jobs run on a thread
+    pool: downloads overlap on the shared connection pool, and Pillow releases
+    the GIL while resizing, compositing and encoding. Returns the output paths
+    in job order; if a job fails, its exception is raised.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(apply_frame, **job) for job in jobs]
+        return [future.result() for future in futures]
 
-    return output_path
+
+def _prefetch_index() -> None:
+    try:
+        _get_device_frames_index()
+    except Exception:
+        # Offline or failing fetches are retried (and raised) on first real use.
+        pass
+
+
+def prefetch_index() -> None:
+    """Start fetching the device frames index in a background thread.
+
+    Call this early (e.g. at application startup) so that the first lookup
+    doesn't wait on the network. Errors are ignored here and raised by the
+    first lookup instead.
+    """
+    threading.Thread(target=_prefetch_index, name="device-frames-prefetch", daemon=True).start()
+
+
+def _reset_after_fork() -> None:
+    """Give a forked child fresh locks and its own HTTP connections.
+
+    Another thread may have held a lock or been mid-refresh at the fork, and
+    that thread doesn't exist in the child.
+    """
+    global _session, _session_lock, _index_lock, _index_fetch_lock, _index_refreshing
+
+    _session = None
+    _session_lock = threading.Lock()
+    _index_lock = threading.Lock()
+    _index_fetch_lock = threading.Lock()
+    _index_refreshing = False
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from device_frames_core import list_devices, find_template, get_frame_image, get_mask_image, apply_frame
+from device_frames_core import list_devices, find_template, get_frame_image, get_mask_image, apply_frame, apply_frames
 
 # Test list_devices
 print("=== Testing list_devices ===")
@@ -39,6 +39,11 @@ try:
 except ValueError as e:
     print(f"✓ Caught expected error: {e}")
 
+try:
+    find_template(device="", variation="black-titanium")  # Should fail - empty device
+except ValueError as e:
+    print(f"✓ Caught expected error: {e}")
+
 # Test apply_frame
 print("\n=== Testing apply_frame ===")
 output = apply_frame(
@@ -49,4 +54,19 @@ output = apply_frame(
     category="ios",
 )
 print(f"✓ Frame applied successfully")
-print(f"Output: {output}")
\ No newline at end of file
+print(f"Output: {output}")
+
+# Test apply_frames
+print("\n=== Testing apply_frames ===")
+outputs = apply_frames([
+    {
+        "screenshot_path": Path("tests/iphone.PNG"),
+        "device": "16-pro-max",
+        "variation": "black-titanium",
+        "output_path": Path(f"tests/iphone_framed_{i}.png"),
+        "category": "ios",
+    }
+    for i in range(2)
+])
+print(f"✓ Frames applied successfully")
+print(f"Outputs: {outputs}")